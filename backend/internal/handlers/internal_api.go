@@ -1,11 +1,13 @@
 package handlers
 
 import (
+	"compress/gzip"
 	"crypto/rand"
 	"crypto/sha256"
 	"encoding/hex"
 	"encoding/json"
 	"fmt"
+	"io"
 	"log/slog"
 	"net/http"
 
@@ -93,7 +95,17 @@ func (h *InternalHandler) StoreAudit(w http.ResponseWriter, r *http.Request) {
 		OrgID   string                  `json:"org_id"`
 		Entries []repository.AuditEntry `json:"entries"`
 	}
-	if err := json.NewDecoder(r.Body).Decode(&req); err != nil {
+	var body io.Reader = r.Body
+	if r.Header.Get("Content-Encoding") == "gzip" {
+		gz, err := gzip.NewReader(r.Body)
+		if err != nil {
+			http.Error(w, "bad request", 400)
+			return
+		}
+		defer gz.Close()
+		body = gz
+	}
+	if err := json.NewDecoder(body).Decode(&req); err != nil {
 		http.Error(w, "bad request", 400)
 		return
 	}
@@ -4,6 +4,8 @@ import (
 	"context"
 	"database/sql"
 	"encoding/json"
+	"fmt"
+	"strings"
 
 	"github.com/google/uuid"
 )
@@ -22,28 +24,44 @@ type AuditEntry struct {
 	BlockedBy  string          `json:"blocked_by,omitempty"`
 }
 
+// auditInsertChunk bounds rows per multi-row INSERT so a statement stays well
+// under Postgres's 65535 bind-parameter limit (9 parameters per row).
+const auditInsertChunk = 500
+
 func (r *AuditRepo) StoreBatch(ctx context.Context, taskID string, orgID string, entries []AuditEntry) error {
+	if len(entries) == 0 {
+		return nil
+	}
 	tx, err := r.db.BeginTx(ctx, nil)
 	if err != nil {
 		return err
 	}
 	defer tx.Rollback()
 
-	stmt, err := tx.PrepareContext(ctx,
-		`INSERT INTO agent_audit_trail (task_id, org_id, step_number, action_type, tool_name, tool_input, tool_output, tokens_used, blocked_by)
-		 VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)`)
-	if err != nil {
-		return err
-	}
-	defer stmt.Close()
-
 	tID, _ := uuid.Parse(taskID)
 	oID, _ := uuid.Parse(orgID)
-	for _, e := range entries {
-		inputJSON, _ := json.Marshal(e.ToolInput)
-		outputJSON, _ := json.Marshal(e.ToolOutput)
-		_, err := stmt.ExecContext(ctx, tID, oID, e.StepNumber, e.ActionType, e.ToolName, inputJSON, outputJSON, e.TokensUsed, e.BlockedBy)
-		if err != nil {
+	for start := 0; start < len(entries); start += auditInsertChunk {
+		end := start + auditInsertChunk
+		if end > len(entries) {
+			end = len(entries)
+		}
+		chunk := entries[start:end]
+
+		var sb strings.Builder
+		sb.WriteString(`INSERT INTO agent_audit_trail (task_id, org_id, step_number, action_type, tool_name, tool_input, tool_output, tokens_used, blocked_by) VALUES `)
+		args := make([]interface{}, 0, len(chunk)*9)
+		for i, e := range chunk {
+			if i > 0 {
+				sb.WriteString(", ")
+			}
+			n := i * 9
+			fmt.Fprintf(&sb, "($%d, $%d, $%d, $%d, $%d, $%d, $%d, $%d, $%d)",
+				n+1, n+2, n+3, n+4, n+5, n+6, n+7, n+8, n+9)
+			inputJSON, _ := json.Marshal(e.ToolInput)
+			outputJSON, _ := json.Marshal(e.ToolOutput)
+			args = append(args, tID, oID, e.StepNumber, e.ActionType, e.ToolName, inputJSON, outputJSON, e.TokensUsed, e.BlockedBy)
+		}
+		if _, err := tx.ExecContext(ctx, sb.String(), args...); err != nil {
 			return err
 		}
 	}
@@ -1,8 +1,9 @@
-"""Shared httpx client — connection pool reused across all modules.
+"""Shared httpx clients — connection pools reused across all modules.
 
 Prevents per-request TCP connection churn. Every module that calls the Go
 backend should import `backend_client` from here instead of creating
-its own `httpx.AsyncClient()`.
+its own `httpx.AsyncClient()`. Outbound calls to third-party APIs (e.g.
+Serper) go through `external_client`, which negotiates HTTP/2 over TLS.
 """
 import os, httpx
 
@@ -10,6 +11,7 @@ BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8080")
 INTERNAL_KEY = os.getenv("INTERNAL_API_KEY", "")
 
 _backend_client: httpx.AsyncClient | None = None
+_external_client: httpx.AsyncClient | None = None
 
 def get_backend_client() -> httpx.AsyncClient:
     global _backend_client
@@ -27,3 +29,19 @@ async def close_backend_client():
     if _backend_client and not _backend_client.is_closed:
         await _backend_client.aclose()
         _backend_client = None
+
+def get_external_client() -> httpx.AsyncClient:
+    global _external_client
+    if _external_client is None or _external_client.is_closed:
+        _external_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            http2=True,
+        )
+    return _external_client
+
+async def close_external_client():
+    global _external_client
+    if _external_client and not _external_client.is_closed:
+        await _external_client.aclose()
+        _external_client = None
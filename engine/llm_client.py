@@ -0,0 +1,36 @@
+"""Shared Anthropic client — one connection pool reused across all modules.
+
+Prevents per-call client construction and TLS churn to the Claude API. Every
+module that calls Claude should use `get_anthropic_client()` from here
+instead of creating its own `Anthropic()`, and hold `llm_semaphore` around
+each call so bursts queue locally instead of tripping API rate limits.
+"""
+import os, asyncio
+from anthropic import AsyncAnthropic
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "16"))
+llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+_anthropic_client: AsyncAnthropic | None = None
+
+_USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+def cached_system(text: str) -> list[dict]:
+    """System prompt as a cache_control block — repeated calls reuse the cached tools+system prefix."""
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+def usage_tokens(usage) -> int:
+    """Total tokens for a call; cached prompt tokens are reported outside input_tokens."""
+    return sum(getattr(usage, f, 0) or 0 for f in _USAGE_FIELDS)
+
+def get_anthropic_client() -> AsyncAnthropic:
+    global _anthropic_client
+    if _anthropic_client is None:
+        _anthropic_client = AsyncAnthropic(max_retries=2)
+    return _anthropic_client
+
+async def close_anthropic_client():
+    global _anthropic_client
+    if _anthropic_client is not None:
+        await _anthropic_client.close()
+        _anthropic_client = None
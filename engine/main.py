@@ -1,19 +1,23 @@
 """InaiUrai Engine v5.0 — AI Workforce-as-a-Service."""
-import json, os, re, asyncio, base64, time, hmac, signal, uuid
-import logging
+import os, re, asyncio, base64, time, hmac, signal, uuid
+import atexit, logging, logging.handlers, queue
+import orjson
 from collections import defaultdict
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException, APIRouter
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from typing import Optional
-from anthropic import Anthropic
 from pipeline.agent_loop import agent_loop
+from pipeline.entity_batcher import entity_batcher
 from pipeline.orchestrator import orchestrate_engagement, route_to_role
 from pipeline.planner import plan as run_planner
 from tools.doc_parser import parse_file
-from utils import parse_json_response
-from http_client import get_backend_client, close_backend_client
+from utils import parse_json_response, extract_text
+from http_client import get_backend_client, close_backend_client, close_external_client
+from llm_client import get_anthropic_client, close_anthropic_client, llm_semaphore
 
 LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
 
@@ -30,9 +34,15 @@ class JSONFormatter(logging.Formatter):
                 log[key] = getattr(record, key)
         if record.exc_info and record.exc_info[0]:
             log["error"] = f"{record.exc_info[0].__name__}: {record.exc_info[1]}"
-        return json.dumps(log)
+        return orjson.dumps(log, default=str).decode()
 
-def setup_logging():
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue the raw record; formatting happens on the listener thread, keeping exc_info for JSONFormatter."""
+    def prepare(self, record):
+        return record
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route records through a queue so formatting and stream I/O never run on the event loop."""
     root = logging.getLogger()
     root.setLevel(logging.INFO)
     handler = logging.StreamHandler()
@@ -40,9 +50,15 @@ def setup_logging():
         handler.setFormatter(JSONFormatter())
     else:
         handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
-    root.handlers = [handler]
-
-setup_logging()
+    log_queue = queue.SimpleQueue()
+    root.handlers = [_DeferredQueueHandler(log_queue)]
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+_log_listener = setup_logging()
+# Stop at interpreter exit, not lifespan end — uvicorn still logs after lifespan, and lifespan can rerun
+atexit.register(_log_listener.stop)
 logger = logging.getLogger("inaiurai.engine")
 
 INTERNAL_KEY = os.getenv("INTERNAL_API_KEY", "")
@@ -74,19 +90,14 @@ async def lifespan(app):
     logger.info("Engine shutting down — waiting for in-flight tasks")
     for _ in range(MAX_CONCURRENT_TASKS):
         await _task_semaphore.acquire()
+    await entity_batcher.close()
     await close_backend_client()
+    await close_external_client()
+    await close_anthropic_client()
     logger.info("All tasks drained. Shutdown complete.")
 
 app = FastAPI(title="InaiUrai Engine", version="5.0", lifespan=lifespan)
-
-_anthropic_client = None
-def get_anthropic_client() -> Anthropic:
-    global _anthropic_client
-    if _anthropic_client is None:
-        _anthropic_client = Anthropic()
-    return _anthropic_client
-
-client = get_anthropic_client()
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 def _verify_key(provided: str) -> bool:
     """Constant-time key verification with rotation support."""
@@ -151,6 +162,10 @@ class TaskRequest(BaseModel):
         if len(self.input_text) > MAX_INPUT_LENGTH:
             self.input_text = self.input_text[:MAX_INPUT_LENGTH]
 
+_TaskRequestAdapter = TypeAdapter(TaskRequest)
+_TASK_REQUEST_OPENAPI = {"requestBody": {"required": True,
+    "content": {"application/json": {"schema": TaskRequest.model_json_schema()}}}}
+
 class OrchestrateRequest(BaseModel):
     objective: str
     org_context: dict = {}
@@ -193,8 +208,15 @@ class PIIRequest(BaseModel):
 
 v1 = APIRouter(prefix="/v1", tags=["v1"])
 
-@v1.post("/run_task")
-async def run_task(req: TaskRequest):
+@v1.post("/run_task", response_model=None, openapi_extra=_TASK_REQUEST_OPENAPI)
+async def run_task(request: Request):
+    """Hot path: validate the raw body in pydantic-core, skipping FastAPI's dict round-trip."""
+    try:
+        req = _TaskRequestAdapter.validate_json(await request.body())
+    except ValidationError as e:
+        # Same error shape as a declared body model: loc starts with "body"
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])}
+            for err in e.errors(include_url=False)])
     if req.org_id and not check_rate_limit(req.org_id):
         raise HTTPException(status_code=429, detail="Rate limit exceeded. Max 30 requests/minute.")
     async with _task_semaphore:
@@ -230,31 +252,32 @@ async def list_roles():
 async def extract_context(req: ExtractRequest):
     text = req.text
     try:
+        # PDF/DOCX/XLSX parsing is CPU-bound (up to 10MB) — keep it off the event loop
         if req.encoding == "base64":
-            text = parse_file(base64.b64decode(req.text), req.mime_type)
+            text = await asyncio.to_thread(lambda: parse_file(base64.b64decode(req.text), req.mime_type))
         elif req.mime_type and req.mime_type != "text/plain":
-            text = parse_file(req.text.encode("utf-8", errors="replace"), req.mime_type)
+            text = await asyncio.to_thread(parse_file, req.text.encode("utf-8", errors="replace"), req.mime_type)
     except Exception:
         return {"summary": "Failed to decode file", "entities_found": []}
-    loop = asyncio.get_running_loop()
     try:
-        response = await loop.run_in_executor(None, lambda: client.messages.create(
-            model="claude-sonnet-4-6", max_tokens=500,
-            system='Summarize in under 200 words. Extract entities. JSON only: {"summary":"...","entities_found":[...]}',
-            messages=[{"role": "user", "content": text[:5000]}]))
-        return parse_json_response(response.content[0].text)
+        async with llm_semaphore:
+            response = await get_anthropic_client().messages.create(
+                model="claude-sonnet-4-6", max_tokens=500,
+                system='Summarize in under 200 words. Extract entities. JSON only: {"summary":"...","entities_found":[...]}',
+                messages=[{"role": "user", "content": text[:5000]}])
+        return parse_json_response(extract_text(response))
     except Exception:
         return {"summary": "Context extraction failed", "entities_found": []}
 
 @v1.post("/generate_soul")
 async def generate_soul(req: SoulRequest):
-    loop = asyncio.get_running_loop()
     try:
-        response = await loop.run_in_executor(None, lambda: client.messages.create(
-            model="claude-sonnet-4-6", max_tokens=300,
-            system="Based on this organization data, write a 100-200 word instruction for an AI employee about how to work for this organization. Include: their business, industry, competitors, products, brand voice. Write in second person. Be specific.",
-            messages=[{"role": "user", "content": req.text[:10000]}]))
-        return {"soul": response.content[0].text}
+        async with llm_semaphore:
+            response = await get_anthropic_client().messages.create(
+                model="claude-sonnet-4-6", max_tokens=300,
+                system="Based on this organization data, write a 100-200 word instruction for an AI employee about how to work for this organization. Include: their business, industry, competitors, products, brand voice. Write in second person. Be specific.",
+                messages=[{"role": "user", "content": req.text[:10000]}])
+        return {"soul": extract_text(response)}
     except Exception:
         return {"soul": "New organization. Learn about this client through conversation."}
 
@@ -276,9 +299,11 @@ async def get_trace(task_id: str):
 app.include_router(v1)
 app.include_router(v1, prefix="")
 
+_HEALTH_OK = JSONResponse({"status": "ok", "version": "5.0"})
+
 @app.get("/health")
 async def health():
-    return {"status": "ok", "version": "5.0"}
+    return _HEALTH_OK
 
 @app.get("/health/ready")
 async def health_ready():
@@ -286,11 +311,9 @@ async def health_ready():
     checks = {"engine": "ok", "backend": "unknown", "anthropic": "unknown"}
     ready = True
     try:
-        import httpx
-        async with httpx.AsyncClient() as c:
-            r = await c.get(f"{os.getenv('BACKEND_URL', 'http://backend:8080')}/health", timeout=3)
-            checks["backend"] = "ok" if r.status_code == 200 else f"error:{r.status_code}"
-            if r.status_code != 200: ready = False
+        r = await get_backend_client().get("/health", timeout=3)
+        checks["backend"] = "ok" if r.status_code == 200 else f"error:{r.status_code}"
+        if r.status_code != 200: ready = False
     except Exception:
         checks["backend"] = "unreachable"; ready = False
     try:
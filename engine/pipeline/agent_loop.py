@@ -6,21 +6,19 @@ Every step → Audit Trail (Layer 5)
 Web content → Prompt Firewall (Layer 2)
 Final output → Output Validator (Layer 3)
 """
-import os, json, time, asyncio, logging
-from anthropic import Anthropic
+import os, json, time, logging
+from llm_client import get_anthropic_client, llm_semaphore, cached_system, usage_tokens
 from pipeline.audit import AuditLogger
 from pipeline.cost_governor import CostMeter, check_daily_limit, record_task_cost
 from pipeline.tool_proxy import ToolProxy
 from pipeline.firewall import sanitize_web_content, wrap_untrusted_content
 from pipeline.output_validator import validate_output
+from pipeline.entity_batcher import entity_batcher
 from configs.roles.base import get_role_config
-from utils import parse_json_response
 from http_client import get_backend_client
 
 logger = logging.getLogger("inaiurai.agent_loop")
 
-client = Anthropic()
-
 GUARDRAIL_INSTRUCTIONS = """
 CRITICAL RULES (enforced by system):
 - You can ONLY use the tools provided. Do not call tools not in your list.
@@ -139,7 +137,7 @@ class AgentLoop:
 
         proxy = ToolProxy(role_slug=role_slug, org_id=cost.org_id, audit=audit, context_fetcher=context_fetcher)
         goal_ancestry = req.get("goal_ancestry")
-        system = build_system_prompt(role_config, org_soul, member_profile, context, goal_ancestry)
+        system = cached_system(build_system_prompt(role_config, org_soul, member_profile, context, goal_ancestry))
         tools = proxy.get_tool_schemas()
         messages = [{"role": "user", "content": input_text}]
         final_output = None
@@ -152,12 +150,13 @@ class AgentLoop:
                 final_output = await self._force_output(system, messages, cost)
                 break
 
-            loop = asyncio.get_running_loop()
-            response = await loop.run_in_executor(None, lambda: client.messages.create(
-                model="claude-sonnet-4-6", max_tokens=4000, system=system,
-                tools=tools if tools else None, messages=messages))
+            async with llm_semaphore:
+                async with get_anthropic_client().messages.stream(
+                    model="claude-sonnet-4-6", max_tokens=4000, system=system,
+                    tools=tools if tools else None, messages=messages) as stream:
+                    response = await stream.get_final_message()
 
-            tokens = getattr(response.usage, "input_tokens", 0) + getattr(response.usage, "output_tokens", 0)
+            tokens = usage_tokens(response.usage)
             cost.record_tokens(tokens)
 
             if response.stop_reason == "end_turn":
@@ -201,7 +200,7 @@ class AgentLoop:
         validation = validate_output(final_output, role_slug, cost.org_id)
         entities = {}
         if len(validation.output) > 200:
-            entities = await self._extract_entities(validation.output)
+            entities = await self._extract_entities(validation.output, cost.org_id)
         return {"output_text": validation.output, "quality_score": 8.0 if validation.is_valid else 6.0,
             "status": "success", "extracted_entities": entities, "audit_summary": audit.summary(), "cost_summary": cost.summary()}
 
@@ -219,24 +218,17 @@ class AgentLoop:
 
     async def _force_output(self, system, messages, cost):
         msgs = messages + [{"role": "user", "content": PARTIAL_RESULT}]
-        loop = asyncio.get_running_loop()
         try:
-            r = await loop.run_in_executor(None, lambda: client.messages.create(
-                model="claude-sonnet-4-6", max_tokens=4000, system=system, messages=msgs))
-            cost.record_tokens(getattr(r.usage,"input_tokens",0)+getattr(r.usage,"output_tokens",0))
+            async with llm_semaphore:
+                async with get_anthropic_client().messages.stream(
+                    model="claude-sonnet-4-6", max_tokens=4000, system=system, messages=msgs) as stream:
+                    r = await stream.get_final_message()
+            cost.record_tokens(usage_tokens(r.usage))
             return "\n".join(b.text for b in r.content if hasattr(b,"text"))
         except Exception:
             return "Processing limit reached. Please try breaking this into smaller requests."
 
-    async def _extract_entities(self, output):
-        try:
-            loop = asyncio.get_running_loop()
-            r = await loop.run_in_executor(None, lambda: client.messages.create(
-                model="claude-haiku-4-5-20251001", max_tokens=300,
-                system='Extract entities. JSON only: {"companies":[],"people":[],"products":[],"metrics":[]}',
-                messages=[{"role":"user","content":output[:2000]}]))
-            return parse_json_response(r.content[0].text)
-        except Exception:
-            return {}
+    async def _extract_entities(self, output, org_id):
+        return await entity_batcher.extract(output, org_id)
 
 agent_loop = AgentLoop()
@@ -1,5 +1,6 @@
 """Audit Logger: Append-only log of every agent reasoning step."""
-import os, json, time, logging
+import os, json, time, gzip, logging
+import orjson
 from dataclasses import dataclass, field
 from pathlib import Path
 from http_client import get_backend_client
@@ -8,8 +9,9 @@ logger = logging.getLogger("inaiurai.audit")
 AUDIT_FALLBACK_DIR = Path(os.getenv("AUDIT_FALLBACK_DIR", "/tmp/audit_fallback"))
 
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8080")
+GZIP_MIN_BYTES = 1024
 
-@dataclass
+@dataclass(slots=True)
 class AuditEntry:
     step_number: int; action_type: str; tool_name: str|None = None
     tool_input: dict|None = None; tool_output: dict|None = None
@@ -44,16 +46,26 @@ class AuditLogger:
         payload = {"task_id": self.task_id, "org_id": self.org_id,
             "entries": [{"step_number":e.step_number,"action_type":e.action_type,"tool_name":e.tool_name,
                 "tool_input":e.tool_input,"tool_output":e.tool_output,"tokens_used":e.tokens_used,"blocked_by":e.blocked_by} for e in self.entries]}
+        try:
+            body = orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson rejects ints wider than 64 bits even with default=; stdlib json handles them
+            body = json.dumps(payload, default=str).encode()
+        headers = {"Content-Type": "application/json"}
+        wire = body
+        if len(body) > GZIP_MIN_BYTES:
+            wire = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
         try:
             c = get_backend_client()
-            await c.post("/api/internal/audit", json=payload, timeout=10)
+            await c.post("/api/internal/audit", content=wire, headers=headers, timeout=10)
         except Exception as exc:
             logger.warning(f"audit flush failed, writing to fallback: {type(exc).__name__}",
                 extra={"task_id": self.task_id, "org_id": self.org_id})
             try:
                 AUDIT_FALLBACK_DIR.mkdir(parents=True, exist_ok=True)
                 fallback_path = AUDIT_FALLBACK_DIR / f"{self.task_id}_{int(time.time())}.json"
-                fallback_path.write_text(json.dumps(payload, default=str))
+                fallback_path.write_bytes(body)
             except Exception as file_exc:
                 logger.error(f"audit fallback write ALSO failed: {type(file_exc).__name__}",
                     extra={"task_id": self.task_id})
@@ -5,12 +5,13 @@ For solo messages: auto-routes to the best single role.
 For complex objectives: proposes multi-role team with execution plan.
 """
 import json
+import time
 import asyncio
-from anthropic import Anthropic
+from collections import OrderedDict
+from functools import lru_cache
+from llm_client import get_anthropic_client, llm_semaphore, cached_system
 from configs.roles.base import get_all_roles, ROLE_CONFIGS
-from utils import parse_json_response
-
-client = Anthropic()
+from utils import parse_json_response, extract_text
 
 ORCHESTRATOR_SYSTEM = """You are the InaiUrai engagement planner. Your job is to analyze a customer's
 business objective and determine the right team of AI executives to accomplish it.
@@ -87,6 +88,7 @@ Rules:
 """
 
 
+@lru_cache(maxsize=None)
 def _roles_list() -> str:
     lines = []
     for r in get_all_roles():
@@ -95,23 +97,50 @@ def _roles_list() -> str:
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=None)
+def _render_system(template: str) -> str:
+    """ROLE_CONFIGS is static, so each system prompt only needs rendering once."""
+    return template.replace("{roles_list}", _roles_list())
+
+
+_inflight: dict[tuple, asyncio.Task] = {}
+
+
+async def _single_flight(key: tuple, factory):
+    """Coalesce identical concurrent LLM calls (e.g. backend retries) into one.
+
+    The call runs as its own task so a cancelled caller doesn't cancel it for the others.
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(factory())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return await asyncio.shield(task)
+
+
 async def orchestrate_engagement(req: dict) -> dict:
     """Analyze objective and return engagement plan with team composition."""
     objective = req.get("objective", "")
     org_soul = req.get("org_soul", "")
+    result = await _single_flight(("orchestrate", objective, org_soul),
+        lambda: _orchestrate_llm(objective, org_soul))
+    return dict(result)
 
+
+async def _orchestrate_llm(objective: str, org_soul: str) -> dict:
     user_msg = f"OBJECTIVE: {objective}"
     if org_soul:
         user_msg += f"\n\nORGANIZATION CONTEXT:\n{org_soul}"
 
-    system = ORCHESTRATOR_SYSTEM.replace("{roles_list}", _roles_list())
+    system = cached_system(_render_system(ORCHESTRATOR_SYSTEM))
 
-    loop = asyncio.get_running_loop()
     try:
-        response = await loop.run_in_executor(None, lambda: client.messages.create(
-            model="claude-sonnet-4-6", max_tokens=1500,
-            system=system, messages=[{"role": "user", "content": user_msg}]))
-        result = parse_json_response(response.content[0].text)
+        async with llm_semaphore:
+            response = await get_anthropic_client().messages.create(
+                model="claude-sonnet-4-6", max_tokens=1500,
+                system=system, messages=[{"role": "user", "content": user_msg}])
+        result = parse_json_response(extract_text(response))
         valid_slugs = set(ROLE_CONFIGS.keys())
         validated_team = [r for r in result.get("team", []) if r.get("role_slug") in valid_slugs]
         if not validated_team:
@@ -133,23 +162,45 @@ async def orchestrate_engagement(req: dict) -> dict:
             "summary": "Routing to Chief of Staff (orchestration unavailable)", "error": "orchestration_failed"}
 
 
+ROUTE_CACHE_TTL_SECONDS = 600
+ROUTE_CACHE_MAX_ENTRIES = 1024
+_route_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+
+
 async def route_to_role(input_text: str, org_soul: str = "") -> dict:
     """For solo messages: determine the single best role to handle this request."""
+    key = (input_text.strip().lower(), org_soul[:500])
+    hit = _route_cache.get(key)
+    if hit and time.monotonic() - hit[0] < ROUTE_CACHE_TTL_SECONDS:
+        _route_cache.move_to_end(key)
+        return dict(hit[1])
+
+    result = await _single_flight(("route",) + key, lambda: _route_llm(input_text, org_soul))
+    if result is None:
+        return {"role_slug": "chief-of-staff", "reasoning": "fallback"}
+    _route_cache[key] = (time.monotonic(), result)
+    _route_cache.move_to_end(key)
+    while len(_route_cache) > ROUTE_CACHE_MAX_ENTRIES:
+        _route_cache.popitem(last=False)
+    return dict(result)
+
+
+async def _route_llm(input_text: str, org_soul: str) -> dict | None:
     user_msg = f"MESSAGE: {input_text}"
     if org_soul:
         user_msg += f"\n\nORG CONTEXT: {org_soul[:500]}"
 
-    system = ROUTE_SYSTEM.replace("{roles_list}", _roles_list())
+    system = _render_system(ROUTE_SYSTEM)
 
-    loop = asyncio.get_running_loop()
     try:
-        response = await loop.run_in_executor(None, lambda: client.messages.create(
-            model="claude-haiku-4-5-20251001", max_tokens=200,
-            system=system, messages=[{"role": "user", "content": user_msg}]))
-        result = parse_json_response(response.content[0].text)
+        async with llm_semaphore:
+            response = await get_anthropic_client().messages.create(
+                model="claude-haiku-4-5-20251001", max_tokens=200,
+                system=system, messages=[{"role": "user", "content": user_msg}])
+        result = parse_json_response(extract_text(response))
         slug = result.get("role_slug", "chief-of-staff")
         if slug not in ROLE_CONFIGS:
             slug = "chief-of-staff"
         return {"role_slug": slug, "reasoning": result.get("reasoning", "")}
     except Exception:
-        return {"role_slug": "chief-of-staff", "reasoning": "fallback"}
+        return None
@@ -1,8 +1,7 @@
 """Intent classifier: determines what the user wants (Haiku-powered)."""
-import json, asyncio
-from anthropic import Anthropic
-from utils import parse_json_response
-client = Anthropic()
+import json
+from llm_client import get_anthropic_client, llm_semaphore
+from utils import parse_json_response, extract_text
 
 SYSTEM = """Classify this request. Available intents: research, summarize, extract, write, translate, analyze, general_chat, assistant.
 Return ONLY JSON: {"intent":"...","required_context":[],"entity_references":[],"context_budget":"light|medium|heavy"}"""
@@ -10,10 +9,10 @@ Return ONLY JSON: {"intent":"...","required_context":[],"entity_references":[],"
 async def plan(input_text, org_summary=None):
     msg = f"Message: {input_text}"
     if org_summary: msg += f"\nContext: {json.dumps(org_summary)}"
-    loop = asyncio.get_running_loop()
     try:
-        r = await loop.run_in_executor(None, lambda: client.messages.create(
-            model="claude-haiku-4-5-20251001", max_tokens=300, system=SYSTEM, messages=[{"role":"user","content":msg}]))
-        return parse_json_response(r.content[0].text)
+        async with llm_semaphore:
+            r = await get_anthropic_client().messages.create(
+                model="claude-haiku-4-5-20251001", max_tokens=300, system=SYSTEM, messages=[{"role":"user","content":msg}])
+        return parse_json_response(extract_text(r))
     except Exception:
         return {"intent":"general_chat","required_context":["soul","business_profile"],"context_budget":"medium","degraded":True}
@@ -0,0 +1,16 @@
+"""Engine entrypoint — uvicorn with WORKERS worker processes (default 1).
+
+Each worker has its own event loop, shared clients (http_client,
+llm_client) and in-memory state. The per-org rate limiter and the
+MAX_CONCURRENT_TASKS / LLM_CONCURRENCY semaphores are per process, so
+every extra worker multiplies those limits; keep WORKERS at 1 until they
+are shared across workers (the /route cache, single-flight map and entity
+batcher are fine per worker).
+"""
+import os
+import uvicorn
+
+if __name__ == "__main__":
+    uvicorn.run("main:app", host="0.0.0.0", port=8000,
+        workers=int(os.getenv("WORKERS", "1")), loop="uvloop", http="httptools",
+        log_config=None)
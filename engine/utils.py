@@ -1,7 +1,12 @@
-import json, re
+import re
+import orjson
 
 def parse_json_response(text: str) -> dict:
     cleaned = text.strip()
     cleaned = re.sub(r"^`(?:json)?\s*", "", cleaned)
     cleaned = re.sub(r"\s*`$", "", cleaned)
-    return json.loads(cleaned)
+    return orjson.loads(cleaned)
+
+def extract_text(message) -> str:
+    """Concatenate the text blocks of a Claude message, skipping tool_use/thinking blocks."""
+    return "".join(b.text for b in message.content if getattr(b, "type", None) == "text")